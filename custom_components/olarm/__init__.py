@@ -1,20 +1,19 @@
 """The Olarm integration."""
 import asyncio
 import logging
-import time
-from datetime import datetime, timedelta
+import random
+from functools import partial
+from datetime import timedelta
 
 import aiohttp
-import async_timeout
-import voluptuous as vol
+from aiohttp.hdrs import USER_AGENT
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 
 from .api import OlarmApiClient, OlarmApiError
 from .auth import OlarmAuth
@@ -28,9 +27,13 @@ from .const import (
     CONF_MQTT_ONLY,
     CONF_DEBUG_MQTT,
     DEFAULT_SCAN_INTERVAL,
+    MQTT_CHECK_INTERVAL,
+    MQTT_CHECK_JITTER,
+    MQTT_CONNECT_CONCURRENCY,
+    MQTT_INITIAL_CHECK_DELAY,
+    MQTT_RECONNECT_CONCURRENCY,
     DOMAIN,
     PLATFORMS,
-    SIGNAL_OLARM_MQTT_UPDATE,
     SERVICE_CHECK_MQTT_STATUS,
 )
 
@@ -40,6 +43,147 @@ _LOGGER = logging.getLogger(__name__)
 # Force the logger to show all messages at least at INFO level
 _LOGGER.setLevel(logging.INFO)
 
+SCAN_INTERVAL = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+MQTT_CHECK_PERIOD = timedelta(seconds=MQTT_CHECK_INTERVAL)
+
+# Entry data keys required for email/password auth
+_CREDENTIAL_KEYS = frozenset({CONF_USER_EMAIL_PHONE, CONF_USER_PASS})
+
+# MQTT-only mode messages, each sent to all log sinks via _emit
+_MQTT_ONLY_ENABLED_MSG = "⚠️ MQTT-ONLY MODE ENABLED: No API calls will be made"
+_MQTT_ONLY_UNAVAILABLE_MSG = "⚠️ MQTT-ONLY MODE: Device %s will be unavailable"
+_MQTT_ONLY_NO_CONNECTIONS_MSG = (
+    "⚠️ MQTT-ONLY MODE: No MQTT connections were established, integration will not function!"
+)
+
+# Shared by every entry so periodic checks can't start a reconnect storm
+_RECONNECT_LIMIT = asyncio.Semaphore(MQTT_RECONNECT_CONCURRENCY)
+
+# Connection state labels, indexed by is_connected
+_CONN_STATE = ("🔴 DISCONNECTED", "🟢 CONNECTED")
+
+def _emit(level: int, msg: str, *args) -> None:
+    """Log one %-style setup message, once, through the HA logger."""
+    # The direct/MQTT helpers propagate to the same HA log, so a copy
+    # through them would only duplicate the line
+    _LOGGER.log(level, msg, *args)
+
+def _create_mqtt_client(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    device: dict,
+    auth: OlarmAuth,
+    debug_mqtt: bool,
+    on_message,
+) -> OlarmMqttClient:
+    """Create an MQTT client for a device, wired to the message handler."""
+    imei = device["imei"]
+    device_name = device.get("name", "Unknown Device")
+    
+    _emit(logging.WARNING, "🔄 Setting up MQTT for device: %s (IMEI: %s)", device_name, imei)
+    
+    return OlarmMqttClient(
+        hass, 
+        imei, 
+        auth.access_token,
+        device["id"],
+        device_name,
+        debug_mqtt,
+        on_message=on_message,
+        auth=auth,
+        entry_id=entry.entry_id,
+    )
+
+async def _async_disconnect_clients(hass: HomeAssistant, clients) -> None:
+    """Disconnect MQTT clients in parallel without blocking the event loop."""
+    # async_disconnect() lets queued actions reach the broker, then joins
+    # the paho network thread in the executor
+    _emit(logging.WARNING, "Disconnecting %d MQTT clients", len(clients))
+    await asyncio.gather(
+        *(client.async_disconnect() for client in clients),
+        return_exceptions=True,
+    )
+
+def _cancel_reconnects(reconnect_tasks: dict) -> None:
+    """Cancel checker-initiated reconnects that are still running."""
+    for task in reconnect_tasks.values():
+        task.cancel()
+    reconnect_tasks.clear()
+
+async def _async_limited_reconnect(client: OlarmMqttClient) -> bool:
+    """Reconnect a client, bounded by the shared reconnect limit."""
+    async with _RECONNECT_LIMIT:
+        return await client.connect()
+
+def _check_clients(
+    hass: HomeAssistant, clients, reconnect_tasks: dict, *, include_healthy: bool
+) -> tuple[int, list[str]]:
+    """Nudge MQTT clients that need it and describe what was done.
+    
+    Connected clients are asked for a status update and disconnected ones
+    are reconnected (at most one reconnect per device at a time). Healthy
+    clients are skipped unless include_healthy is set. Returns the log
+    level and report lines for the caller to emit.
+    """
+    level = logging.INFO
+    lines = []
+    
+    for client in clients:
+        if not include_healthy and _mqtt_client_healthy(client):
+            continue
+        
+        device_name = client.device_name
+        connection_state = _CONN_STATE[client.is_connected]
+        lines.append(
+            f"MQTT Status for {device_name} ({client.device_id}): {connection_state}, "
+            f"Messages: {client.messages_received}"
+        )
+        
+        if client.is_connected:
+            if include_healthy:
+                uptime = "Unknown"
+                uptime_seconds = client.uptime_seconds
+                if uptime_seconds is not None:
+                    uptime = _format_duration(uptime_seconds)
+                
+                last_msg = "Never"
+                last_message = client.last_message_seconds_ago
+                if last_message is not None:
+                    last_msg = f"{_format_duration(last_message)} ago"
+                
+                lines.append(f"  - Connected for: {uptime}, last message: {last_msg}")
+            
+            lines.append("  - Requesting status update...")
+            # A manual check must actually exercise the link, even if state is fresh
+            client.publish_status_request(force=include_healthy)
+            continue
+        
+        task = reconnect_tasks.get(client.device_id)
+        if client.reconnect_task is not None or (task is not None and not task.done()):
+            lines.append("  - Reconnect already in progress")
+            continue
+        
+        lines.append("  - Attempting to reconnect...")
+        level = logging.WARNING
+        # Background task: HA startup/shutdown doesn't wait on a reconnect
+        reconnect_tasks[client.device_id] = hass.async_create_background_task(
+            _async_limited_reconnect(client),
+            name=f"olarm_mqtt_reconnect_{client.device_imei}",
+        )
+    
+    return level, lines
+
+def _format_duration(total_seconds) -> str:
+    """Format a number of seconds as "H:MM:SS" (days prefixed if needed)."""
+    return str(timedelta(seconds=int(total_seconds)))
+
+def _mqtt_client_healthy(client: OlarmMqttClient) -> bool:
+    """Return True if a client is connected and has had a recent message."""
+    if not client.is_connected:
+        return False
+    last_message = client.last_message_seconds_ago
+    return last_message is not None and last_message < MQTT_CHECK_INTERVAL
+
 async def async_setup(hass: HomeAssistant, config: dict):
     """Set up the Olarm component."""
     hass.data.setdefault(DOMAIN, {})
@@ -48,359 +192,94 @@ async def async_setup(hass: HomeAssistant, config: dict):
     async def shutdown_hook(event):
         """Shutdown hook for the integration."""
         direct_log("Olarm integration shutdown hook triggered")
-        for entry_id, data in hass.data.get(DOMAIN, {}).items():
-            if "mqtt_clients" in data:
-                for client in data["mqtt_clients"].values():
-                    direct_log(f"Disconnecting MQTT client for {client.device_name}")
-                    client.disconnect()
+        clients = [
+            client
+            for data in hass.data.get(DOMAIN, {}).values()
+            for client in data.get("mqtt_clients", {}).values()
+        ]
+        if clients:
+            await _async_disconnect_clients(hass, clients)
     
     # Register shutdown listener
     hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, shutdown_hook)
     
     return True
 
+def _async_create_session() -> aiohttp.ClientSession:
+    """Create the client session used for Olarm HTTP requests."""
+    # A small per-host limit avoids the request hangs some mesh Wi-Fi
+    # routers show under bursts of parallel connections
+    connector = aiohttp.TCPConnector(
+        limit_per_host=4,
+        keepalive_timeout=75,
+        ttl_dns_cache=300,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=30),
+        headers={USER_AGENT: SERVER_SOFTWARE},
+    )
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up Olarm from a config entry."""
     # Log entry data (without passwords)
-    entry_data_safe = {k: v for k, v in entry.data.items() if k != CONF_USER_PASS}
+    entry_data_safe = dict(entry.data)
+    entry_data_safe.pop(CONF_USER_PASS, None)
     direct_log(f"Setting up Olarm integration with data: {entry_data_safe}")
     _LOGGER.info("Setting up Olarm integration with data: %s", entry_data_safe)
     
-    session = async_get_clientsession(hass)
-    
-    # Set up data structures
-    hass.data.setdefault(DOMAIN, {})
+    # Set up data structures (async_setup already created hass.data[DOMAIN])
     entry_data = hass.data[DOMAIN].setdefault(entry.entry_id, {})
-    mqtt_only = entry.data.get(CONF_MQTT_ONLY, False)
-    debug_mqtt = entry.data.get(CONF_DEBUG_MQTT, False)
+    
+    # Dedicated session so auth and API requests keep their TCP+TLS
+    # connections alive between polls; closed on unload or failed setup,
+    # and on shutdown since HA doesn't unload entries when it stops
+    session = _async_create_session()
+    entry_data["session"] = session
+    entry.async_on_unload(session.close)
+    
+    async def _async_close_session(event):
+        """Close the session when Home Assistant shuts down."""
+        await session.close()
+    
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    )
     
     # Initialize either with email/password or API key auth
     if CONF_API_KEY in entry.data:
-        # Email/password auth - use MQTT for everything
-        direct_log("Setting up with email/password authentication (MQTT-only mode)")
-        _LOGGER.info("Setting up with email/password authentication (MQTT-only mode)")
-        mqtt_log("Setting up Olarm integration with email/password auth (MQTT-only mode)")
-        
-        # Force MQTT-only mode since we're not using API key
-        mqtt_only = True
-        direct_log("⚠️ MQTT-ONLY MODE ENABLED: No API calls will be made")
-        _LOGGER.warning("⚠️ MQTT-ONLY MODE ENABLED: No API calls will be made")
-        mqtt_log("⚠️ MQTT-ONLY MODE ENABLED: No API calls will be made")
-        
-        # Mark API as disabled
-        entry_data["api_enabled"] = False
-        
-        # Initialize auth
-        auth = OlarmAuth(
-            hass, 
-            entry.data[CONF_USER_EMAIL_PHONE], 
-            entry.data[CONF_USER_PASS], 
-            session
-        )
-        
-        try:
-            direct_log("Starting auth initialization...")
-            auth_success = await auth.initialize()
-            if not auth_success:
-                error_msg = "Authentication initialization failed"
-                direct_log(error_msg)
-                _LOGGER.error(error_msg)
-                raise Exception(error_msg)
-                
-            direct_log("Auth initialized successfully")
-            _LOGGER.info("Auth initialized successfully")
-                
-        except Exception as ex:
-            log_exception(ex, "Auth")
-            direct_log(f"Auth error: {ex}")
-            _LOGGER.error("Auth error: %s", ex)
-            raise
-        
-        entry_data["auth"] = auth
-        
-        # Get devices from auth
-        devices = auth.get_devices()
-        if not devices:
-            direct_log("No devices found for user")
-            _LOGGER.warning("No devices found for user")
-            mqtt_log("No devices found for user - MQTT setup will be skipped")
-            return False
-        else:
-            direct_log(f"Found {len(devices)} devices")
-            _LOGGER.info("Found %d devices", len(devices))
-        
-        # Create a dummy coordinator for compatibility with platform setup
-        # This will not make any API calls but will provide the device structure
-        # needed by the platform entities
-        dummy_devices = {}
-        for device in devices:
-            device_id = device["id"]
-            device_name = device.get("name", "Unknown Device")
-            # Create a minimal device structure with required fields
-            dummy_devices[device_id] = {
-                "deviceId": device_id,
-                "deviceName": device_name,
-                "deviceProfile": {
-                    "areasLimit": 1,
-                    "areasLabels": ["Main Area"],
-                    "zonesLimit": 0,
-                    "zonesLabels": [],
-                    "pgmLimit": 0,
-                    "pgmLabels": []
-                },
-                "deviceState": {
-                    "areas": ["disarm"],
-                    "zones": []
-                }
-            }
-        
-        # Create a dummy client for compatibility with platform setup
-        dummy_client = OlarmApiClient("dummy_token", session)
-        entry_data["client"] = dummy_client
-        
-        # Create a dummy coordinator that doesn't make API calls
-        class DummyCoordinator(DataUpdateCoordinator):
-            """Dummy coordinator that doesn't make API calls."""
-            
-            def __init__(self, hass, devices):
-                """Initialize the dummy coordinator."""
-                super().__init__(
-                    hass,
-                    _LOGGER,
-                    name=DOMAIN,
-                    update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
-                )
-                self.devices = devices
-                self.data = devices
-            
-            async def _async_update_data(self):
-                """Return the current data without making API calls."""
-                direct_log("Dummy coordinator update - no API calls made")
-                return self.devices
-        
-        coordinator = DummyCoordinator(hass, dummy_devices)
-        entry_data["coordinator"] = coordinator
-        
-        # Set up message handler
-        message_handler = OlarmMessageHandler(hass, entry.entry_id)
-        entry_data["message_handler"] = message_handler
-        
-        # Set up MQTT clients for each device
-        mqtt_clients = {}
-        direct_log(f"🔄 Setting up MQTT for {len(devices)} devices")
-        _LOGGER.warning("🔄 Setting up MQTT for %d devices", len(devices))
-        mqtt_log(f"Setting up MQTT for {len(devices)} devices")
-        
-        # Get the access token for MQTT connections
-        tokens = auth.get_tokens()
-        if not tokens["access_token"]:
-            direct_log("No access token available, cannot set up MQTT")
-            _LOGGER.error("No access token available, cannot set up MQTT")
-            return False
-        
-        for device in devices:
-            device_id = device["id"]
-            imei = device["imei"]
-            device_name = device.get("name", "Unknown Device")
-            
-            direct_log(f"🔄 Setting up MQTT for device: {device_name} (IMEI: {imei})")
-            _LOGGER.warning("🔄 Setting up MQTT for device: %s (IMEI: %s)", device_name, imei)
-            mqtt_log(f"Setting up MQTT for device: {device_name} (IMEI: {imei})")
-            
-            # Create MQTT client
-            mqtt_client = OlarmMqttClient(
-                hass, 
-                imei, 
-                tokens["access_token"],
-                device_id,
-                device_name,
-                debug_mqtt
-            )
-            
-            # Register message callback
-            mqtt_client.register_message_callback(message_handler.process_mqtt_message)
-            
-            # Connect to MQTT
-            try:
-                connected = await mqtt_client.connect()
-                if connected:
-                    direct_log(f"✅ MQTT connected for device: {device_name}")
-                    _LOGGER.warning("✅ MQTT connected for device: %s", device_name)
-                    mqtt_log(f"✅ MQTT connected for device: {device_name}")
-                    mqtt_clients[device_id] = mqtt_client
-                else:
-                    direct_log(f"❌ MQTT connection failed for device: {device_name}")
-                    _LOGGER.error("❌ MQTT connection failed for device: %s", device_name)
-                    mqtt_log(f"❌ MQTT connection failed for device: {device_name}")
-                    
-                    direct_log(f"⚠️ MQTT-ONLY MODE: Device {device_name} will be unavailable")
-                    _LOGGER.error("⚠️ MQTT-ONLY MODE: Device %s will be unavailable", device_name)
-                    mqtt_log(f"⚠️ MQTT-ONLY MODE: Device {device_name} will be unavailable")
-            except Exception as mqtt_ex:
-                log_exception(mqtt_ex, f"MQTT connection for {device_name}")
-                direct_log(f"MQTT connection error for {device_name}: {mqtt_ex}")
-                _LOGGER.error("MQTT connection error for %s: %s", device_name, mqtt_ex)
-                # Continue to next device, don't raise the exception
-        
-        entry_data["mqtt_clients"] = mqtt_clients
-        
-        # Setup periodic MQTT checks if we have clients
-        if mqtt_clients:
-            mqtt_count = len(mqtt_clients)
-            total_count = len(devices)
-            success_percent = int(mqtt_count/total_count*100) if total_count > 0 else 0
-            
-            direct_log(
-                f"✅ MQTT setup complete: {mqtt_count}/{total_count} devices connected ({success_percent}%)"
-            )
-            _LOGGER.warning(
-                "✅ MQTT setup complete: %d/%d devices connected (%s%%)",
-                mqtt_count, total_count, success_percent
-            )
-            mqtt_log(f"✅ MQTT setup complete: {mqtt_count}/{total_count} devices connected ({success_percent}%)")
-            entry_data["mqtt_enabled"] = True
-            
-            # Set up a periodic task to check MQTT status
-            async def check_mqtt_periodically(now=None):
-                """Check MQTT status periodically and log results."""
-                direct_log("🔄 Performing periodic MQTT check")
-                _LOGGER.warning("🔄 Performing periodic MQTT check")
-                mqtt_log("🔄 Performing periodic MQTT check")
-                
-                for device_id, client in mqtt_clients.items():
-                    status = client.get_status()
-                    connection_state = "🟢 CONNECTED" if status["is_connected"] else "🔴 DISCONNECTED"
-                    
-                    direct_log(
-                        f"MQTT Status for {status['device_name']}: {connection_state}, Messages: {status['messages_received']}"
-                    )
-                    _LOGGER.warning(
-                        "MQTT Status for %s: %s, Messages: %d",
-                        status["device_name"], connection_state, status["messages_received"]
-                    )
-                    mqtt_log(f"Status for {status['device_name']}: {connection_state}, Messages: {status['messages_received']}")
-                    
-                    # If connected, request a status update
-                    if status["is_connected"]:
-                        direct_log(f"Requesting MQTT update for {status['device_name']}")
-                        _LOGGER.warning("Requesting MQTT update for %s", status["device_name"])
-                        mqtt_log(f"Requesting update for {status['device_name']}")
-                        client.publish_status_request()
-                    else:
-                        direct_log(f"Attempting to reconnect {status['device_name']}")
-                        _LOGGER.warning("Attempting to reconnect %s", status["device_name"])
-                        mqtt_log(f"Attempting to reconnect {status['device_name']}")
-                        hass.async_create_task(client.connect())
-            
-            # Register a periodic check every 5 minutes
-            entry_data["mqtt_checker"] = async_track_time_interval(
-                hass, 
-                check_mqtt_periodically, 
-                timedelta(minutes=5)
-            )
-            
-            # Also run once right now
-            hass.async_create_task(check_mqtt_periodically())
-        else:
-            direct_log("⚠️ MQTT-ONLY MODE: No MQTT connections were established, integration will not function!")
-            _LOGGER.error("⚠️ MQTT-ONLY MODE: No MQTT connections were established, integration will not function!")
-            mqtt_log("⚠️ MQTT-ONLY MODE: No MQTT connections were established, integration will not function!")
-            entry_data["mqtt_enabled"] = False
-            return False
-    
-    elif CONF_USER_EMAIL_PHONE in entry.data and CONF_USER_PASS in entry.data:
-        # API key method - use API for everything
-        direct_log("Setting up with API key authentication")
-        _LOGGER.info("Setting up with API key authentication")
-        
-        client = OlarmApiClient(entry.data[CONF_API_KEY], session)
-        entry_data["client"] = client
-        
-        # Set up coordinator
-        coordinator = OlarmDataUpdateCoordinator(hass, client)
-        
-        try:
-            await coordinator.async_config_entry_first_refresh()
-        except Exception as ex:
-            log_exception(ex, "Coordinator refresh")
-            _LOGGER.error("Error in coordinator refresh: %s", ex)
-            raise
-            
-        entry_data["coordinator"] = coordinator
-        
-        # We don't have MQTT with API key method
-        entry_data["mqtt_enabled"] = False
-        # API is enabled since we're using the API key
-        entry_data["api_enabled"] = True
-        
+        setup_ok = await _async_setup_with_api_key(hass, entry, entry_data, session)
+    elif _CREDENTIAL_KEYS <= entry.data.keys():
+        setup_ok = await _async_setup_with_credentials(hass, entry, entry_data, session)
     else:
         # This shouldn't happen
         _LOGGER.error("Neither API key nor email/password provided")
         return False
     
+    if not setup_ok:
+        return False
+    
     # Register the MQTT status service
     async def async_check_mqtt_status(call):
         """Service to check MQTT status."""
-        direct_log("Manual MQTT status check triggered")
         mqtt_log("Manual MQTT status check triggered")
         
         if "mqtt_clients" not in entry_data:
-            direct_log("No MQTT clients available - email/password authentication required for MQTT support")
             _LOGGER.warning("No MQTT clients available - email/password authentication required for MQTT support")
             mqtt_log("No MQTT clients available - email/password authentication required")
             return
             
         mqtt_clients = entry_data["mqtt_clients"]
         if not mqtt_clients:
-            direct_log("No active MQTT clients found")
             _LOGGER.warning("No active MQTT clients found")
             mqtt_log("No active MQTT clients found")
             return
             
-        for device_id, client in mqtt_clients.items():
-            status = client.get_status()
-            connection_state = "🟢 CONNECTED" if status["is_connected"] else "🔴 DISCONNECTED"
-            
-            direct_log(f"MQTT Status for {status['device_name']} ({device_id}): {connection_state}")
-            _LOGGER.warning(
-                "MQTT Status for %s (%s): %s", 
-                status["device_name"], device_id, connection_state
-            )
-            mqtt_log(f"Status for {status['device_name']} ({device_id}): {connection_state}")
-            
-            if status["is_connected"]:
-                uptime = "Unknown"
-                if status["uptime_seconds"] is not None:
-                    minutes, seconds = divmod(status["uptime_seconds"], 60)
-                    hours, minutes = divmod(minutes, 60)
-                    uptime = f"{hours}h {minutes}m {seconds}s"
-                
-                last_msg = "Never"
-                if status["last_message_seconds_ago"] is not None:
-                    minutes, seconds = divmod(status["last_message_seconds_ago"], 60)
-                    hours, minutes = divmod(minutes, 60)
-                    last_msg = f"{hours}h {minutes}m {seconds}s ago"
-                
-                direct_log(
-                    f"  - Connected for: {uptime}, {status['messages_received']} messages received, last message: {last_msg}"
-                )
-                _LOGGER.warning(
-                    "  - Connected for: %s, %d messages received, last message: %s",
-                    uptime, status["messages_received"], last_msg
-                )
-                mqtt_log(f"  - Connected for: {uptime}, {status['messages_received']} messages received, last message: {last_msg}")
-            
-            # Request a status update from each client to verify it still works
-            if status["is_connected"]:
-                direct_log("  - Testing connection by requesting status update...")
-                _LOGGER.warning("  - Testing connection by requesting status update...")
-                mqtt_log("  - Testing connection by requesting status update...")
-                client.publish_status_request()
-            else:
-                direct_log("  - Attempting to reconnect...")
-                _LOGGER.warning("  - Attempting to reconnect...")
-                mqtt_log("  - Attempting to reconnect...")
-                hass.async_create_task(client.connect())
+        reconnect_tasks = entry_data.setdefault("reconnect_tasks", {})
+        _, lines = _check_clients(
+            hass, mqtt_clients.values(), reconnect_tasks, include_healthy=True
+        )
+        _emit(logging.WARNING, "\n".join(lines))
     
     # Register the service
     hass.services.async_register(
@@ -409,16 +288,280 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     direct_log(f"Registered service: {DOMAIN}.{SERVICE_CHECK_MQTT_STATUS}")
     mqtt_log(f"Registered service: {DOMAIN}.{SERVICE_CHECK_MQTT_STATUS}")
     
-    # Store MQTT-only setting in entry_data for platforms to access
-    entry_data["mqtt_only"] = mqtt_only
-    
     # Load platform entities
-    for platform in PLATFORMS:
-        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    
+    _emit(logging.INFO, "Olarm integration setup complete")
+    return True
+
+async def _async_setup_with_credentials(
+    hass: HomeAssistant, entry: ConfigEntry, entry_data: dict, session: aiohttp.ClientSession
+) -> bool:
+    """Set up an entry using email/password auth and MQTT for everything."""
+    debug_mqtt = entry.data.get(CONF_DEBUG_MQTT, False)
+    
+    # Email/password auth - use MQTT for everything
+    direct_log("Setting up with email/password authentication (MQTT-only mode)")
+    _LOGGER.info("Setting up with email/password authentication (MQTT-only mode)")
+    mqtt_log("Setting up Olarm integration with email/password auth (MQTT-only mode)")
+    
+    # Force MQTT-only mode since we're not using API key
+    entry_data["mqtt_only"] = True
+    _emit(logging.WARNING, _MQTT_ONLY_ENABLED_MSG)
+    
+    # Mark API as disabled
+    entry_data["api_enabled"] = False
+    
+    # Initialize auth
+    auth = OlarmAuth(
+        hass, 
+        entry.data[CONF_USER_EMAIL_PHONE], 
+        entry.data[CONF_USER_PASS], 
+        session
+    )
+    
+    try:
+        direct_log("Starting auth initialization...")
+        auth_success = await auth.initialize()
+        if not auth_success:
+            error_msg = "Authentication initialization failed"
+            direct_log(error_msg)
+            _LOGGER.error(error_msg)
+            raise Exception(error_msg)
+    
+        direct_log("Auth initialized successfully")
+        _LOGGER.info("Auth initialized successfully")
+    
+    except Exception as ex:
+        log_exception(ex, "Auth")
+        direct_log(f"Auth error: {ex}")
+        _LOGGER.error("Auth error: %s", ex)
+        raise
+    
+    entry_data["auth"] = auth
+    
+    # Get devices from auth
+    devices = auth.get_devices()
+    if not devices:
+        direct_log("No devices found for user")
+        _LOGGER.warning("No devices found for user")
+        mqtt_log("No devices found for user - MQTT setup will be skipped")
+        return False
+    else:
+        direct_log(f"Found {len(devices)} devices")
+        _LOGGER.info("Found %d devices", len(devices))
+    
+    # Create a dummy coordinator for compatibility with platform setup
+    # This will not make any API calls but will provide the device structure
+    # needed by the platform entities
+    dummy_devices = {}
+    for device in devices:
+        device_id = device["id"]
+        device_name = device.get("name", "Unknown Device")
+        # Create a minimal device structure with required fields
+        dummy_devices[device_id] = {
+            "deviceId": device_id,
+            "deviceName": device_name,
+            "deviceProfile": {
+                "areasLimit": 1,
+                "areasLabels": ["Main Area"],
+                "zonesLimit": 0,
+                "zonesLabels": [],
+                "pgmLimit": 0,
+                "pgmLabels": []
+            },
+            "deviceState": {
+                "areas": ["disarm"],
+                "zones": []
+            }
+        }
+    
+    # Create a dummy client for compatibility with platform setup
+    dummy_client = OlarmApiClient("dummy_token", session)
+    entry_data["client"] = dummy_client
+    
+    # Create a dummy coordinator that doesn't make API calls
+    class DummyCoordinator(DataUpdateCoordinator):
+        """Dummy coordinator that doesn't make API calls."""
+    
+        def __init__(self, hass, devices):
+            """Initialize the dummy coordinator."""
+            super().__init__(
+                hass,
+                _LOGGER,
+                name=DOMAIN,
+                update_interval=SCAN_INTERVAL,
+            )
+            self.devices = devices
+            self.data = devices
+    
+        async def _async_update_data(self):
+            """Return the current data without making API calls."""
+            direct_log("Dummy coordinator update - no API calls made")
+            return self.devices
+    
+    coordinator = DummyCoordinator(hass, dummy_devices)
+    entry_data["coordinator"] = coordinator
+    
+    # Set up message handler
+    message_handler = OlarmMessageHandler(hass, entry.entry_id)
+    entry_data["message_handler"] = message_handler
+    
+    # Set up MQTT clients for each device
+    mqtt_clients = {}
+    _emit(logging.WARNING, "🔄 Setting up MQTT for %d devices", len(devices))
+    
+    # Clients take their access token (and later refreshes) from auth
+    if not auth.access_token:
+        direct_log("No access token available, cannot set up MQTT")
+        _LOGGER.error("No access token available, cannot set up MQTT")
+        return False
+    
+    # Build every client first so the broker handshakes can run concurrently
+    on_message = message_handler.process_mqtt_message
+    pending_clients = [
+        _create_mqtt_client(hass, entry, device, auth, debug_mqtt, on_message)
+        for device in devices
+    ]
+    
+    # Connect to MQTT, bounding simultaneous handshakes
+    connect_limit = asyncio.Semaphore(MQTT_CONNECT_CONCURRENCY)
+    
+    async def _connect(mqtt_client):
+        """Connect one client once a handshake slot is free."""
+        async with connect_limit:
+            return await mqtt_client.connect()
+    
+    results = await asyncio.gather(
+        *(_connect(mqtt_client) for mqtt_client in pending_clients),
+        return_exceptions=True,
+    )
+    
+    failed_clients = []
+    for mqtt_client, connected in zip(pending_clients, results):
+        device_name = mqtt_client.device_name
+        if connected is True:
+            mqtt_clients[mqtt_client.device_id] = mqtt_client
+        else:
+            failed_clients.append(mqtt_client)
+        
+        imei = mqtt_client.device_imei
+        if isinstance(connected, Exception):
+            log_exception(connected, f"MQTT connection for {device_name}")
+            # Continue to next device, don't raise the exception
+            _emit(
+                logging.ERROR,
+                "MQTT connection error for device: %s (IMEI: %s): %s",
+                device_name, imei, connected,
+            )
+        elif connected:
+            _emit(logging.WARNING, "✅ MQTT connected for device: %s (IMEI: %s)", device_name, imei)
+        else:
+            _emit(
+                logging.ERROR,
+                "❌ MQTT connection failed for device: %s (IMEI: %s)\n" + _MQTT_ONLY_UNAVAILABLE_MSG,
+                device_name, imei, device_name,
+            )
+    
+    # Tear down clients that never connected so their paho network threads
+    # and sockets don't outlive setup
+    if failed_clients:
+        await _async_disconnect_clients(hass, failed_clients)
+    
+    entry_data["mqtt_clients"] = mqtt_clients
+    # Connected clients are disconnected on unload or if setup fails later
+    entry.async_on_unload(
+        partial(_async_disconnect_clients, hass, list(mqtt_clients.values()))
+    )
+    
+    # Setup periodic MQTT checks if we have clients
+    if mqtt_clients:
+        mqtt_count = len(mqtt_clients)
+        total_count = len(devices)
+        success_percent = int(mqtt_count/total_count*100) if total_count > 0 else 0
+    
+        _emit(
+            logging.WARNING,
+            "✅ MQTT setup complete: %d/%d devices connected (%d%%)",
+            mqtt_count, total_count, success_percent,
+        )
+        entry_data["mqtt_enabled"] = True
+    
+        # At most one checker-initiated reconnect per device at a time
+        reconnect_tasks = entry_data["reconnect_tasks"] = {}
+        entry.async_on_unload(partial(_cancel_reconnects, reconnect_tasks))
+    
+        # Set up a periodic task to check MQTT status
+        async def check_mqtt_periodically(now=None):
+            """Check MQTT status periodically and log results."""
+            # Healthy clients already have fresh state; leave them alone
+            level, lines = _check_clients(
+                hass, mqtt_clients.values(), reconnect_tasks, include_healthy=False
+            )
+            if not lines:
+                _LOGGER.debug("Periodic MQTT check: all %d clients healthy", len(mqtt_clients))
+                return
+            
+            # Collect the whole tick and emit it once per log sink
+            _emit(level, "\n".join(["🔄 Performing periodic MQTT check", *lines]))
+    
+        # Disconnected clients keep retrying with backoff capped at
+        # MQTT_RECONNECT_MAX_DELAY, so this is only a slow liveness check
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, 
+                check_mqtt_periodically, 
+                MQTT_CHECK_PERIOD
+            )
+        )
+    
+        # Also run once shortly after setup, once entities are online
+        # (each client already requested a status update on connect).
+        # Jitter keeps several entries from checking in lockstep.
+        entry.async_on_unload(
+            async_call_later(
+                hass,
+                MQTT_INITIAL_CHECK_DELAY + random.uniform(0, MQTT_CHECK_JITTER),
+                check_mqtt_periodically,
+            )
+        )
+    else:
+        _emit(logging.ERROR, _MQTT_ONLY_NO_CONNECTIONS_MSG)
+        entry_data["mqtt_enabled"] = False
+        return False
     
-    direct_log("Olarm integration setup complete")
-    mqtt_log("Olarm integration setup complete")
-    _LOGGER.info("Olarm integration setup complete")
+    return True
+
+async def _async_setup_with_api_key(
+    hass: HomeAssistant, entry: ConfigEntry, entry_data: dict, session: aiohttp.ClientSession
+) -> bool:
+    """Set up an entry using API key auth and polling for everything."""
+    # API key method - use API for everything
+    direct_log("Setting up with API key authentication")
+    _LOGGER.info("Setting up with API key authentication")
+    
+    client = OlarmApiClient(entry.data[CONF_API_KEY], session)
+    entry_data["client"] = client
+    
+    # Set up coordinator
+    coordinator = OlarmDataUpdateCoordinator(hass, client)
+    
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception as ex:
+        log_exception(ex, "Coordinator refresh")
+        _LOGGER.error("Error in coordinator refresh: %s", ex)
+        raise
+    
+    entry_data["coordinator"] = coordinator
+    
+    # We don't have MQTT with API key method
+    entry_data["mqtt_enabled"] = False
+    # API is enabled since we're using the API key
+    entry_data["api_enabled"] = True
+    
+    # Store MQTT-only setting in entry_data for platforms to access
+    entry_data["mqtt_only"] = entry.data.get(CONF_MQTT_ONLY, False)
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
@@ -426,28 +569,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     direct_log("Unloading Olarm integration")
     mqtt_log("Unloading Olarm integration")
     
-    # Unload platforms using the new method
-    unload_ok = await hass.config_entries.async_unload_entry_platforms(entry, PLATFORMS)
+    # Unload all platforms in one batch
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
-    # Clean up MQTT clients
-    if unload_ok and entry.entry_id in hass.data[DOMAIN]:
-        entry_data = hass.data[DOMAIN][entry.entry_id]
-        
-        # Cancel periodic MQTT checks if they exist
-        if "mqtt_checker" in entry_data:
-            entry_data["mqtt_checker"]()
-            direct_log("Cancelled MQTT periodic checks")
-            
-        # Disconnect MQTT clients
-        if "mqtt_clients" in entry_data:
-            mqtt_count = len(entry_data["mqtt_clients"])
-            direct_log(f"Disconnecting {mqtt_count} MQTT clients")
-            mqtt_log(f"Disconnecting {mqtt_count} MQTT clients")
-            for client in entry_data["mqtt_clients"].values():
-                client.disconnect()
-        
-        # Clean up data
-        hass.data[DOMAIN].pop(entry.entry_id)
+    # MQTT clients, timers and the session are released by the callbacks
+    # registered with entry.async_on_unload during setup
+    if unload_ok:
+        hass.data[DOMAIN].pop(entry.entry_id, None)
     
     direct_log("Olarm integration unloaded")
     mqtt_log("Olarm integration unloaded")
@@ -462,7 +590,7 @@ class OlarmDataUpdateCoordinator(DataUpdateCoordinator):
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            update_interval=SCAN_INTERVAL,
         )
         self.client = client
         self.auth = auth
@@ -470,30 +598,20 @@ class OlarmDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self):
         """Fetch data from Olarm."""
+        # API key auth has no token to refresh, so skip straight to the fetch
+        if self.auth is not None:
+            await self._async_refresh_token()
+        
         try:
-            # If using auth, ensure token is valid
-            if self.auth:
-                await self.auth.ensure_access_token()
-                # Update client access token if it changed
-                tokens = self.auth.get_tokens()
-                if tokens["access_token"] != self.client.api_key:
-                    direct_log("Updating API client with new access token")
-                    self.client.api_key = tokens["access_token"]
-                    self.client.headers = {"Authorization": f"Bearer {tokens['access_token']}"}
-            
             direct_log("Performing API data update...")
             mqtt_log("Performing API data update...")
             # Get all devices
             result = await self.client.get_devices()
-            devices = {}
-            
-            # Get detailed info for each device
-            for device in result.get("data", []):
-                device_id = device["deviceId"]
-                # Don't need to fetch detail again as the devices endpoint returns full details
-                devices[device_id] = device
             
-            self.devices = devices
+            # Don't need to fetch detail again as the devices endpoint returns full details
+            self.devices = devices = {
+                device["deviceId"]: device for device in result.get("data") or ()
+            }
             device_count = len(devices)
             direct_log(f"API data update complete, found {device_count} devices")
             mqtt_log(f"API data update complete, found {device_count} devices")
@@ -502,4 +620,15 @@ class OlarmDataUpdateCoordinator(DataUpdateCoordinator):
             error_msg = f"Error communicating with API: {err}"
             direct_log(error_msg)
             mqtt_log(f"❌ API Error: {err}", "error")
-            raise UpdateFailed(error_msg)
\ No newline at end of file
+            raise UpdateFailed(error_msg)
+
+    async def _async_refresh_token(self) -> None:
+        """Ensure the auth token is valid and push any rotation to the client."""
+        # Common case: the token is still valid, so no lock or await is needed
+        if not self.auth.token_is_fresh():
+            await self.auth.ensure_access_token()
+        # Update client access token only if it was rotated
+        access_token = self.auth.access_token
+        if access_token != self.client.api_key:
+            direct_log("Updating API client with new access token")
+            self.client.update_api_key(access_token)
\ No newline at end of file
@@ -1,5 +1,7 @@
 """Support for Olarm alarm control panels."""
+import asyncio
 import logging
+import time
 from typing import Any, Dict, Optional, Callable
 
 from homeassistant.components.alarm_control_panel import (
@@ -9,15 +11,17 @@ from homeassistant.components.alarm_control_panel import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 from .api import OlarmApiClient, OlarmApiError
 from .mqtt import OlarmMqttClient
 from .debug import direct_log, mqtt_log, log_exception
 from .const import (
+    ACTION_DUPLICATE_WINDOW,
     ATTR_AC_POWER,
     ATTR_BATTERY,
     CMD_ARM_AWAY,
@@ -29,6 +33,7 @@ from .const import (
     MQTT_CMD_ARM_HOME,
     MQTT_CMD_ARM_NIGHT,
     MQTT_CMD_DISARM,
+    MQTT_STATE_DEBOUNCE,
     STATE_ARMED_AWAY,
     STATE_ARMED_HOME,
     STATE_ARMED_NIGHT,
@@ -50,6 +55,37 @@ OLARM_TO_HA_STATE = {
     STATE_PENDING: AlarmControlPanelState.ARMING,
 }
 
+# Marks that no MQTT outage has been reported yet
+_NOT_REPORTED = object()
+
+# Every panel supports the same arming modes
+_SUPPORTED_FEATURES = (
+    AlarmControlPanelEntityFeature.ARM_HOME
+    | AlarmControlPanelEntityFeature.ARM_AWAY
+    | AlarmControlPanelEntityFeature.ARM_NIGHT
+)
+
+# Alarm actions: (MQTT command, API command, log label)
+_ACTIONS = {
+    "disarm": (MQTT_CMD_DISARM, CMD_DISARM, "disarm"),
+    "arm_away": (MQTT_CMD_ARM_AWAY, CMD_ARM_AWAY, "arm away"),
+    "arm_home": (MQTT_CMD_ARM_HOME, CMD_ARM_HOME, "arm home"),
+    "arm_night": (MQTT_CMD_ARM_NIGHT, CMD_ARM_NIGHT, "arm night"),
+}
+
+def _power_attributes(power: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Map an Olarm power dict ("AC"/"Batt" as "0"/"1") to state attributes."""
+    attributes = {}
+    if not power:
+        return attributes
+    ac = power.get("AC")
+    if ac is not None:
+        attributes[ATTR_AC_POWER] = ac == "1"
+    batt = power.get("Batt")
+    if batt is not None:
+        attributes[ATTR_BATTERY] = batt == "1"
+    return attributes
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -76,44 +112,59 @@ async def async_setup_entry(
     # Add alarm panels for each area in each device
     for device_id, device in coordinator.data.items():
         device_name = device.get("deviceName", "Unknown")
+        device_profile = device.get("deviceProfile")
         
         # Check if device has areas
-        if "deviceProfile" in device and "areasLimit" in device["deviceProfile"]:
-            areas_limit = device["deviceProfile"]["areasLimit"]
-            areas_labels = device["deviceProfile"].get("areasLabels", [])
-            
-            # Add an entity for each area
-            for area_num in range(1, areas_limit + 1):
-                area_name = "Unknown"
-                if len(areas_labels) >= area_num:
-                    area_name = areas_labels[area_num - 1]
-                
-                # If MQTT is available, get the MQTT client for this device
-                mqtt_client = mqtt_clients.get(device_id) if mqtt_enabled else None
-                
-                # Skip devices without MQTT client in MQTT-only mode
-                if mqtt_only and not mqtt_client:
-                    direct_log(f"Skipping alarm panel for {device_name} - {area_name} (Area {area_num}) - no MQTT client in MQTT-only mode")
-                    continue
-                
-                # Log entity creation
-                direct_log(f"Creating alarm panel for {device_name} - {area_name} (Area {area_num})")
-                
-                entities.append(
-                    OlarmAlarmPanel(
-                        coordinator,
-                        client,
-                        device_id,
-                        device_name,
-                        area_num,
-                        area_name,
-                        mqtt_client,
-                        message_handler,
-                        mqtt_enabled,
-                        mqtt_only,
-                        api_enabled,
-                    )
-                )
+        if not device_profile or "areasLimit" not in device_profile:
+            continue
+        
+        # If MQTT is available, get the MQTT client for this device
+        mqtt_client = mqtt_clients.get(device_id) if mqtt_enabled else None
+        
+        # Skip devices without MQTT client in MQTT-only mode
+        if mqtt_only and not mqtt_client:
+            direct_log(f"Skipping alarm panels for {device_name} - no MQTT client in MQTT-only mode")
+            continue
+        
+        # Resolve area names and device info once per device; every area
+        # entity of the device shares them
+        areas_labels = device_profile.get("areasLabels") or []
+        areas = [
+            (area_num, areas_labels[area_num - 1] if area_num <= len(areas_labels) else "Unknown")
+            for area_num in range(1, device_profile["areasLimit"] + 1)
+        ]
+        device_info = DeviceInfo(
+            identifiers={(DOMAIN, device_id)},
+            name=device_name,
+            manufacturer="Olarm",
+            model="Olarm Communicator",
+        )
+        # Commands to any area of one device go out one at a time
+        action_lock = asyncio.Lock()
+        
+        # Log entity creation once per device
+        area_list = ", ".join(f"{area_name} (Area {area_num})" for area_num, area_name in areas)
+        direct_log(f"Creating alarm panels for {device_name}: {area_list}")
+        
+        # Add an entity for each area
+        entities.extend(
+            OlarmAlarmPanel(
+                coordinator,
+                client,
+                device_id,
+                device_name,
+                area_num,
+                area_name,
+                mqtt_client,
+                message_handler,
+                mqtt_enabled,
+                mqtt_only,
+                api_enabled,
+                device_info,
+                action_lock,
+            )
+            for area_num, area_name in areas
+        )
     
     # Log entity count
     direct_log(f"Adding {len(entities)} alarm control panel entities")
@@ -122,6 +173,8 @@ async def async_setup_entry(
 class OlarmAlarmPanel(CoordinatorEntity, AlarmControlPanelEntity):
     """Representation of an Olarm alarm panel."""
 
+    _attr_supported_features = _SUPPORTED_FEATURES
+
     def __init__(
         self,
         coordinator,
@@ -135,6 +188,8 @@ class OlarmAlarmPanel(CoordinatorEntity, AlarmControlPanelEntity):
         mqtt_enabled: bool = False,
         mqtt_only: bool = False,
         api_enabled: bool = True,
+        device_info: Optional[DeviceInfo] = None,
+        action_lock: Optional[asyncio.Lock] = None,
     ):
         """Initialize the alarm panel."""
         super().__init__(coordinator)
@@ -143,26 +198,35 @@ class OlarmAlarmPanel(CoordinatorEntity, AlarmControlPanelEntity):
         self._device_name = device_name
         self._area_num = area_num
         self._area_name = area_name
-        self._mqtt_client = mqtt_client
+        # Resolved once: the client is only kept when MQTT is enabled, so
+        # sending a command just checks whether it's connected
+        self._mqtt_client = mqtt_client if mqtt_enabled else None
         self._message_handler = message_handler
         self._mqtt_enabled = mqtt_enabled
         self._mqtt_only = mqtt_only
         self._api_enabled = api_enabled
         self._current_state = None
+        # One command in flight per device (the lock is shared by its
+        # areas); rapid repeats for this area are dropped
+        self._action_lock = action_lock or asyncio.Lock()
+        self._cached_power = ()  # (AC, Batt) behind the cached attributes
+        # connection_time of the MQTT session whose outage was last reported
+        self._reported_outage = _NOT_REPORTED
+        # Log prefixes, built once instead of per command
+        self._device_tag = f"[{device_name}]"
+        self._error_prefix = f"❌ {self._device_tag}"
+        self._last_action = None
         
         self._attr_unique_id = f"{device_id}_area_{area_num}"
         self._attr_name = f"{device_name} {area_name}"
-        self._attr_supported_features = (
-            AlarmControlPanelEntityFeature.ARM_HOME
-            | AlarmControlPanelEntityFeature.ARM_AWAY
-            | AlarmControlPanelEntityFeature.ARM_NIGHT
-        )
-        self._attr_device_info = DeviceInfo(
+        self._attr_device_info = device_info or DeviceInfo(
             identifiers={(DOMAIN, device_id)},
             name=device_name,
             manufacturer="Olarm",
             model="Olarm Communicator",
         )
+        self._snapshot_device_state()
+        self._refresh_cached_state()
         
         direct_log(f"Initialized alarm panel: {self._attr_name} (MQTT: {mqtt_enabled}, API: {api_enabled})")
 
@@ -172,41 +236,70 @@ class OlarmAlarmPanel(CoordinatorEntity, AlarmControlPanelEntity):
         
         # Register to MQTT updates if available
         if self._mqtt_enabled and self._message_handler:
+            # Bursts of area updates collapse into one state write; the
+            # first write of a burst still happens immediately
+            debouncer = Debouncer(
+                self.hass,
+                _LOGGER,
+                cooldown=MQTT_STATE_DEBOUNCE,
+                immediate=True,
+                function=self.async_write_ha_state,
+            )
+            self.async_on_remove(debouncer.async_cancel)
+            
             @callback
-            def handle_mqtt_update(area_data):
-                """Handle MQTT update."""
-                if area_data.get("area_number") == self._area_num:
-                    old_state = self._current_state
-                    self._current_state = area_data.get("area_state")
-                    
-                    # Log state change
-                    if old_state != self._current_state:
-                        direct_log(f"MQTT update: {self._attr_name} state changed from {old_state} to {self._current_state}")
-                        mqtt_log(f"State change: {self._attr_name} from {old_state} to {self._current_state}")
-                    
-                    self.async_write_ha_state()
+            def handle_mqtt_update(area_state):
+                """Handle MQTT update for this area."""
+                old_state = self._current_state
+                old_attributes = self._attr_extra_state_attributes
+                self._current_state = area_state
+                self._refresh_cached_state()
+                
+                # Every alarm payload re-sends all areas; only write when
+                # this area's state or the power attributes changed
+                if old_state == area_state:
+                    if self._attr_extra_state_attributes != old_attributes:
+                        debouncer.async_schedule_call()
+                    return
+                
+                # Log state change
+                mqtt_log(f"State change: {self._attr_name} from {old_state} to {area_state}")
+                debouncer.async_schedule_call()
             
             # Subscribe to area updates
-            signal = f"{DOMAIN}_{self._device_id}_area_{self._area_num}"
-            direct_log(f"Subscribing to MQTT updates for {self._attr_name} with signal {signal}")
+            direct_log(f"Subscribing to MQTT updates for {self._attr_name}")
             
             self.async_on_remove(
-                async_dispatcher_connect(
-                    self.hass,
-                    signal,
-                    handle_mqtt_update
+                self._message_handler.async_add_area_listener(
+                    self._device_id, self._area_num, handle_mqtt_update
                 )
             )
 
-    @property
-    def alarm_state(self) -> AlarmControlPanelState:
-        """Return the state of the alarm control panel as an enum value."""
-        olarm_state = self._get_olarm_state()
-        if olarm_state is None:
-            return None
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Refresh the cached state from new coordinator data."""
+        self._snapshot_device_state()
+        self._refresh_cached_state()
+        super()._handle_coordinator_update()
+
+    def _snapshot_device_state(self) -> None:
+        """Keep this device's deviceState and area state from the coordinator."""
+        try:
+            self._device_state = self.coordinator.data[self._device_id]["deviceState"]
+        except (KeyError, TypeError):
+            self._device_state = None
         
-        # Map Olarm state to HA enum state
-        return OLARM_TO_HA_STATE.get(olarm_state)
+        # Resolved once per coordinator update (missing data is rare)
+        try:
+            self._coord_area_state = self._device_state["areas"][self._area_num - 1]
+        except (KeyError, IndexError, TypeError):
+            self._coord_area_state = None
+
+    def _refresh_cached_state(self) -> None:
+        """Recompute the alarm state and attributes HA reads from _attr_*."""
+        # Map Olarm state to HA enum state (None maps to None)
+        self._attr_alarm_state = OLARM_TO_HA_STATE.get(self._get_olarm_state())
+        self._attr_extra_state_attributes = self._build_extra_state_attributes()
 
     def _get_olarm_state(self) -> Optional[str]:
         """Get the current Olarm state string."""
@@ -219,300 +312,134 @@ class OlarmAlarmPanel(CoordinatorEntity, AlarmControlPanelEntity):
             return STATE_DISARMED  # Default to disarmed if no MQTT state and API disabled
             
         # Otherwise, fall back to coordinator data
-        if not self.coordinator.data or self._device_id not in self.coordinator.data:
-            return None
-            
-        device = self.coordinator.data[self._device_id]
+        return self._coord_area_state
+
+    def _build_extra_state_attributes(self) -> Dict[str, Any]:
+        """Build the state attributes, reusing the last dict if power is unchanged."""
+        power = self._get_power()
+        power_key = (power.get("AC"), power.get("Batt")) if power else None
+        if power_key == self._cached_power:
+            return self._attr_extra_state_attributes
         
-        if (
-            "deviceState" not in device
-            or "areas" not in device["deviceState"]
-            or len(device["deviceState"]["areas"]) < self._area_num
-        ):
-            return None
-            
-        # Get the area state
-        return device["deviceState"]["areas"][self._area_num - 1]
+        self._cached_power = power_key
+        return _power_attributes(power)
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return the state attributes."""
+    def _get_power(self) -> Optional[Dict[str, Any]]:
+        """Get the current Olarm power dict."""
         # Try to get attributes from MQTT data
         if self._mqtt_enabled and self._message_handler:
             device_state = self._message_handler.get_device_state(self._device_id)
             if device_state and "power" in device_state:
-                attributes = {}
-                power = device_state["power"]
-                if "AC" in power:
-                    attributes[ATTR_AC_POWER] = power["AC"] == "1"
-                if "Batt" in power:
-                    attributes[ATTR_BATTERY] = power["Batt"] == "1"
-                return attributes
+                return device_state["power"]
         
         # Only fall back to coordinator data if API is enabled
-        if not self._api_enabled:
-            return {}
+        if not self._api_enabled or not self._device_state:
+            return None
             
         # Fall back to coordinator data
-        if not self.coordinator.data or self._device_id not in self.coordinator.data:
-            return {}
-            
-        device = self.coordinator.data[self._device_id]
-        attributes = {}
-        
-        # Add power information if available
-        if (
-            "deviceState" in device
-            and "power" in device["deviceState"]
-        ):
-            power = device["deviceState"]["power"]
-            if "AC" in power:
-                attributes[ATTR_AC_POWER] = power["AC"] == "1"
-            if "Batt" in power:
-                attributes[ATTR_BATTERY] = power["Batt"] == "1"
-                
-        return attributes
+        return self._device_state.get("power")
 
     async def async_alarm_disarm(self, code: Optional[str] = None) -> None:
         """Send disarm command."""
-        # Try MQTT if available
-        if self._mqtt_enabled and self._mqtt_client and self._mqtt_client.is_connected:
-            direct_log(f"🔄 MQTT [{self._device_name}]: Using MQTT to disarm area {self._area_name}")
-            _LOGGER.warning("🔄 MQTT [%s]: Using MQTT to disarm area %s", 
-                         self._device_name, self._area_name)
-            mqtt_log(f"Using MQTT to disarm area {self._area_name} on {self._device_name}")
-            
-            success = self._mqtt_client.publish_action(MQTT_CMD_DISARM, self._area_num)
-            if success:
-                return
-            
-            if not self._api_enabled or self._mqtt_only:
-                error_msg = f"❌ [{self._device_name}]: MQTT disarm command failed and API is not available"
-                direct_log(error_msg)
-                _LOGGER.error(error_msg)
-                mqtt_log(error_msg, "error")
-                return
-                
-            direct_log(f"⚠️ MQTT [{self._device_name}]: MQTT disarm failed, falling back to API")
-            _LOGGER.warning("⚠️ MQTT [%s]: MQTT disarm failed, falling back to API", self._device_name)
-            mqtt_log(f"MQTT disarm failed for {self._device_name}, falling back to API", "warning")
-        else:
-            if self._mqtt_enabled:
-                if not self._api_enabled or self._mqtt_only:
-                    error_msg = f"❌ [{self._device_name}]: MQTT client not connected and API is not available"
-                    direct_log(error_msg)
-                    _LOGGER.error(error_msg)
-                    mqtt_log(error_msg, "error")
-                    return
-                direct_log(f"ℹ️ MQTT [{self._device_name}]: MQTT client not connected, using API for disarm")
-                _LOGGER.warning("ℹ️ MQTT [%s]: MQTT client not connected, using API for disarm", 
-                             self._device_name)
-                mqtt_log(f"MQTT client not connected for {self._device_name}, using API for disarm")
-            else:
-                direct_log(f"Using API for disarm (MQTT not enabled) for {self._device_name}")
-                _LOGGER.debug("Using API for disarm (MQTT not enabled)")
-        
-        # Fall back to API if allowed
-        if not self._api_enabled:
-            error_msg = f"❌ [{self._device_name}]: Cannot disarm - API calls are disabled and MQTT failed"
-            direct_log(error_msg)
-            _LOGGER.error(error_msg)
-            return
-            
-        try:
-            direct_log(f"🔄 API [{self._device_name}]: Using API to disarm area {self._area_name}")
-            _LOGGER.warning("🔄 API [%s]: Using API to disarm area %s", 
-                         self._device_name, self._area_name)
-            await self._client.send_device_action(
-                self._device_id, CMD_DISARM, self._area_num
-            )
-            direct_log(f"✅ API [{self._device_name}]: API disarm command sent successfully")
-            _LOGGER.warning("✅ API [%s]: API disarm command sent successfully", self._device_name)
-            await self.coordinator.async_request_refresh()
-        except OlarmApiError as err:
-            log_exception(err, f"API disarm for {self._device_name}")
-            direct_log(f"❌ API [{self._device_name}]: Error disarming alarm via API: {err}")
-            _LOGGER.error("❌ API [%s]: Error disarming alarm via API: %s", self._device_name, err)
+        await self._async_send_command("disarm")
 
     async def async_alarm_arm_away(self, code: Optional[str] = None) -> None:
         """Send arm away command."""
-        # Try MQTT if available
-        if self._mqtt_enabled and self._mqtt_client and self._mqtt_client.is_connected:
-            direct_log(f"🔄 MQTT [{self._device_name}]: Using MQTT to arm away area {self._area_name}")
-            _LOGGER.warning("🔄 MQTT [%s]: Using MQTT to arm away area %s", 
-                          self._device_name, self._area_name)
-            mqtt_log(f"Using MQTT to arm away area {self._area_name} on {self._device_name}")
-            
-            success = self._mqtt_client.publish_action(MQTT_CMD_ARM_AWAY, self._area_num)
-            if success:
-                return
-                
-            if not self._api_enabled or self._mqtt_only:
-                error_msg = f"❌ [{self._device_name}]: MQTT arm away command failed and API is not available"
-                direct_log(error_msg)
-                _LOGGER.error(error_msg)
-                mqtt_log(error_msg, "error")
-                return
-                
-            direct_log(f"⚠️ MQTT [{self._device_name}]: MQTT arm away failed, falling back to API")
-            _LOGGER.warning("⚠️ MQTT [%s]: MQTT arm away failed, falling back to API", self._device_name)
-            mqtt_log(f"MQTT arm away failed for {self._device_name}, falling back to API", "warning")
-        else:
-            if self._mqtt_enabled:
-                if not self._api_enabled or self._mqtt_only:
-                    error_msg = f"❌ [{self._device_name}]: MQTT client not connected and API is not available"
-                    direct_log(error_msg)
-                    _LOGGER.error(error_msg)
-                    mqtt_log(error_msg, "error")
-                    return
-                direct_log(f"ℹ️ MQTT [{self._device_name}]: MQTT client not connected, using API for arm away")
-                _LOGGER.warning("ℹ️ MQTT [%s]: MQTT client not connected, using API for arm away", 
-                              self._device_name)
-                mqtt_log(f"MQTT client not connected for {self._device_name}, using API for arm away")
-            else:
-                direct_log(f"Using API for arm away (MQTT not enabled) for {self._device_name}")
-                _LOGGER.debug("Using API for arm away (MQTT not enabled)")
-                
-        # Fall back to API if allowed
-        if not self._api_enabled:
-            error_msg = f"❌ [{self._device_name}]: Cannot arm away - API calls are disabled and MQTT failed"
-            direct_log(error_msg)
-            _LOGGER.error(error_msg)
-            return
-            
-        try:
-            direct_log(f"🔄 API [{self._device_name}]: Using API to arm away area {self._area_name}")
-            _LOGGER.warning("🔄 API [%s]: Using API to arm away area %s", 
-                          self._device_name, self._area_name)
-            await self._client.send_device_action(
-                self._device_id, CMD_ARM_AWAY, self._area_num
-            )
-            direct_log(f"✅ API [{self._device_name}]: API arm away command sent successfully")
-            _LOGGER.warning("✅ API [%s]: API arm away command sent successfully", self._device_name)
-            await self.coordinator.async_request_refresh()
-        except OlarmApiError as err:
-            log_exception(err, f"API arm away for {self._device_name}")
-            direct_log(f"❌ API [{self._device_name}]: Error arming away via API: {err}")
-            _LOGGER.error("❌ API [%s]: Error arming away via API: %s", self._device_name, err)
+        await self._async_send_command("arm_away")
 
     async def async_alarm_arm_home(self, code: Optional[str] = None) -> None:
         """Send arm home command."""
-        # Try MQTT if available
-        if self._mqtt_enabled and self._mqtt_client and self._mqtt_client.is_connected:
-            direct_log(f"🔄 MQTT [{self._device_name}]: Using MQTT to arm home area {self._area_name}")
-            _LOGGER.warning("🔄 MQTT [%s]: Using MQTT to arm home area %s", 
-                          self._device_name, self._area_name)
-            mqtt_log(f"Using MQTT to arm home area {self._area_name} on {self._device_name}")
-            
-            success = self._mqtt_client.publish_action(MQTT_CMD_ARM_HOME, self._area_num)
-            if success:
-                return
-                
-            if not self._api_enabled or self._mqtt_only:
-                error_msg = f"❌ [{self._device_name}]: MQTT arm home command failed and API is not available"
-                direct_log(error_msg)
-                _LOGGER.error(error_msg)
-                mqtt_log(error_msg, "error")
-                return
-                
-            direct_log(f"⚠️ MQTT [{self._device_name}]: MQTT arm home failed, falling back to API")
-            _LOGGER.warning("⚠️ MQTT [%s]: MQTT arm home failed, falling back to API", self._device_name)
-            mqtt_log(f"MQTT arm home failed for {self._device_name}, falling back to API", "warning")
-        else:
-            if self._mqtt_enabled:
-                if not self._api_enabled or self._mqtt_only:
-                    error_msg = f"❌ [{self._device_name}]: MQTT client not connected and API is not available"
-                    direct_log(error_msg)
-                    _LOGGER.error(error_msg)
-                    mqtt_log(error_msg, "error")
-                    return
-                direct_log(f"ℹ️ MQTT [{self._device_name}]: MQTT client not connected, using API for arm home")
-                _LOGGER.warning("ℹ️ MQTT [%s]: MQTT client not connected, using API for arm home", 
-                              self._device_name)
-                mqtt_log(f"MQTT client not connected for {self._device_name}, using API for arm home")
-            else:
-                direct_log(f"Using API for arm home (MQTT not enabled) for {self._device_name}")
-                _LOGGER.debug("Using API for arm home (MQTT not enabled)")
-                
-        # Fall back to API if allowed
-        if not self._api_enabled:
-            error_msg = f"❌ [{self._device_name}]: Cannot arm home - API calls are disabled and MQTT failed"
-            direct_log(error_msg)
-            _LOGGER.error(error_msg)
-            return
-            
-        try:
-            direct_log(f"🔄 API [{self._device_name}]: Using API to arm home area {self._area_name}")
-            _LOGGER.warning("🔄 API [%s]: Using API to arm home area %s", 
-                          self._device_name, self._area_name)
-            await self._client.send_device_action(
-                self._device_id, CMD_ARM_HOME, self._area_num
-            )
-            direct_log(f"✅ API [{self._device_name}]: API arm home command sent successfully")
-            _LOGGER.warning("✅ API [%s]: API arm home command sent successfully", self._device_name)
-            await self.coordinator.async_request_refresh()
-        except OlarmApiError as err:
-            log_exception(err, f"API arm home for {self._device_name}")
-            direct_log(f"❌ API [{self._device_name}]: Error arming home via API: {err}")
-            _LOGGER.error("❌ API [%s]: Error arming home via API: %s", self._device_name, err)
+        await self._async_send_command("arm_home")
 
     async def async_alarm_arm_night(self, code: Optional[str] = None) -> None:
         """Send arm night command."""
+        await self._async_send_command("arm_night")
+
+    async def _async_send_command(self, action: str) -> None:
+        """Send an alarm command unless it repeats one just sent for this area."""
+        now = time.monotonic()
+        
+        # Serialise so a burst across areas can't fan out into parallel
+        # MQTT/API sends to the same device. The repeat check runs under the
+        # lock so a queued repeat sees the command that was just delivered.
+        async with self._action_lock:
+            last_action = self._last_action
+            if (
+                last_action is not None
+                and last_action[0] == action
+                and now - last_action[1] < ACTION_DUPLICATE_WINDOW
+            ):
+                _LOGGER.debug("Dropping repeated %s for %s", action, self._attr_name)
+                return
+            
+            # Only a delivered command counts, so a retry after a failure goes out
+            if await self._async_deliver_command(*_ACTIONS[action]):
+                self._last_action = (action, now)
+
+    async def _async_deliver_command(self, mqtt_cmd: str, api_cmd: str, label: str) -> bool:
+        """Send an alarm command over MQTT, falling back to the API if allowed.
+        
+        Returns True if the command was handed to MQTT or accepted by the API.
+        """
+        api_enabled = self._api_enabled
+        can_fall_back = api_enabled and not self._mqtt_only
+        
         # Try MQTT if available
-        if self._mqtt_enabled and self._mqtt_client and self._mqtt_client.is_connected:
-            direct_log(f"🔄 MQTT [{self._device_name}]: Using MQTT to arm night area {self._area_name}")
-            _LOGGER.warning("🔄 MQTT [%s]: Using MQTT to arm night area %s", 
-                         self._device_name, self._area_name)
-            mqtt_log(f"Using MQTT to arm night area {self._area_name} on {self._device_name}")
+        mqtt_client = self._mqtt_client
+        if mqtt_client is not None and mqtt_client.is_connected:
+            _LOGGER.debug("MQTT %s: area %s on %s", label, self._area_num, self._device_name)
             
-            success = self._mqtt_client.publish_action(MQTT_CMD_ARM_NIGHT, self._area_num)
+            success = mqtt_client.publish_action(mqtt_cmd, self._area_num)
             if success:
-                return
-                
-            if not self._api_enabled or self._mqtt_only:
-                error_msg = f"❌ [{self._device_name}]: MQTT arm night command failed and API is not available"
+                return True
+            
+            if not can_fall_back:
+                error_msg = f"{self._error_prefix}: MQTT {label} command failed and API is not available"
                 direct_log(error_msg)
                 _LOGGER.error(error_msg)
                 mqtt_log(error_msg, "error")
-                return
-                
-            direct_log(f"⚠️ MQTT [{self._device_name}]: MQTT arm night failed, falling back to API")
-            _LOGGER.warning("⚠️ MQTT [%s]: MQTT arm night failed, falling back to API", self._device_name)
-            mqtt_log(f"MQTT arm night failed for {self._device_name}, falling back to API", "warning")
-        else:
-            if self._mqtt_enabled:
-                if not self._api_enabled or self._mqtt_only:
-                    error_msg = f"❌ [{self._device_name}]: MQTT client not connected and API is not available"
-                    direct_log(error_msg)
-                    _LOGGER.error(error_msg)
-                    mqtt_log(error_msg, "error")
-                    return
-                direct_log(f"ℹ️ MQTT [{self._device_name}]: MQTT client not connected, using API for arm night")
-                _LOGGER.warning("ℹ️ MQTT [%s]: MQTT client not connected, using API for arm night", 
-                              self._device_name)
-                mqtt_log(f"MQTT client not connected for {self._device_name}, using API for arm night")
-            else:
-                direct_log(f"Using API for arm night (MQTT not enabled) for {self._device_name}")
-                _LOGGER.debug("Using API for arm night (MQTT not enabled)")
+                return False
                 
+            _LOGGER.warning("⚠️ MQTT [%s]: MQTT %s failed, falling back to API", self._device_name, label)
+            mqtt_log(f"MQTT {label} failed for {self._device_name}, falling back to API", "warning")
+        elif self._mqtt_enabled:
+            if not can_fall_back:
+                # Every rejected command fails the service call, but the
+                # error is logged once per outage. A reconnect sets a new
+                # connection_time, so the next outage is logged again.
+                outage = mqtt_client.connection_time if mqtt_client is not None else None
+                if outage == self._reported_outage:
+                    _LOGGER.debug("MQTT %s rejected for %s: not connected", label, self._device_name)
+                else:
+                    self._reported_outage = outage
+                    _LOGGER.error(
+                        "%s: MQTT client not connected and API is not available",
+                        self._error_prefix,
+                    )
+                raise HomeAssistantError(
+                    f"Cannot {label} {self._attr_name}: MQTT is not connected"
+                )
+            _LOGGER.warning("ℹ️ MQTT [%s]: MQTT client not connected, using API for %s", 
+                         self._device_name, label)
+            mqtt_log(f"MQTT client not connected for {self._device_name}, using API for {label}")
+        
         # Fall back to API if allowed
-        if not self._api_enabled:
-            error_msg = f"❌ [{self._device_name}]: Cannot arm night - API calls are disabled and MQTT failed"
+        if not api_enabled:
+            error_msg = f"{self._error_prefix}: Cannot {label} - API calls are disabled and MQTT failed"
             direct_log(error_msg)
             _LOGGER.error(error_msg)
-            return
+            return False
             
         try:
-            direct_log(f"🔄 API [{self._device_name}]: Using API to arm night area {self._area_name}")
-            _LOGGER.warning("🔄 API [%s]: Using API to arm night area %s", 
-                          self._device_name, self._area_name)
             await self._client.send_device_action(
-                self._device_id, CMD_ARM_NIGHT, self._area_num
+                self._device_id, api_cmd, self._area_num
             )
-            direct_log(f"✅ API [{self._device_name}]: API arm night command sent successfully")
-            _LOGGER.warning("✅ API [%s]: API arm night command sent successfully", self._device_name)
-            await self.coordinator.async_request_refresh()
+            _LOGGER.debug("API %s: area %s on %s sent", label, self._area_num, self._device_name)
+            # The caller only needs the command accepted; poll in the background
+            self.hass.async_create_task(self.coordinator.async_request_refresh())
+            return True
         except OlarmApiError as err:
-            log_exception(err, f"API arm night for {self._device_name}")
-            direct_log(f"❌ API [{self._device_name}]: Error arming night via API: {err}")
-            _LOGGER.error("❌ API [%s]: Error arming night via API: %s", self._device_name, err)
\ No newline at end of file
+            log_exception(err, f"API {label} for {self._device_name}")
+            direct_log(f"❌ API {self._device_tag}: Error sending {label} via API: {err}")
+            _LOGGER.error("❌ API [%s]: Error sending %s via API: %s", self._device_name, label, err)
+            return False
@@ -16,6 +16,11 @@ class OlarmApiClient:
         self.base_url = "https://apiv4.olarm.co/api/v4"
         self.headers = {"Authorization": f"Bearer {api_key}"}
 
+    def update_api_key(self, api_key: str) -> None:
+        """Replace the bearer token used for requests."""
+        self.api_key = api_key
+        self.headers["Authorization"] = f"Bearer {api_key}"
+
     async def get_devices(self, search: str = None, page: int = 1, page_length: int = 50) -> Dict[str, Any]:
         """Get all devices."""
         params = {"page": page, "pageLength": page_length}
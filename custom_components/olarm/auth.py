@@ -1,12 +1,11 @@
 """Authentication handler for Olarm integration."""
-import os
 import logging
 import json
 import time
+import random
 from typing import Dict, List, Optional, Any, Tuple
 import asyncio
 
-import aiohttp
 import async_timeout
 from aiohttp import ClientSession
 
@@ -42,6 +41,12 @@ class OlarmAuth:
         self.token_expiration = None
         self.devices = []
         
+        # Serialises token checks so concurrent callers share one refresh
+        self._refresh_lock = asyncio.Lock()
+        # Refresh 60-120s before expiry so multiple entries don't all
+        # hit the auth server at the same moment
+        self._expiry_margin = 60000 + random.randint(0, 60000)
+        
         # Set the storage path for tokens
         self.storage_file = self.hass.config.path(f".{DOMAIN}_tokens.json")
         
@@ -220,9 +225,8 @@ class OlarmAuth:
                 direct_log(f"Found {len(self.devices)} devices")
                 _LOGGER.warning("Found %d devices", len(self.devices))
                 for device in self.devices:
-                    device_info = f"Device: {device.get('name')}, IMEI: {device.get('imei')}"
-                    direct_log(device_info)
-                    _LOGGER.warning(device_info)
+                    direct_log(f"Device: {device.get('name')}, IMEI: {device.get('imei')}")
+                    _LOGGER.warning("Device: %s, IMEI: %s", device.get("name"), device.get("imei"))
                         
                 return True
                 
@@ -288,16 +292,32 @@ class OlarmAuth:
             _LOGGER.error("Error refreshing token: %s", error)
             return False
 
+    def token_is_fresh(self) -> bool:
+        """Return True if the token and devices can be used without any request."""
+        return bool(
+            self.access_token
+            and self.token_expiration
+            and self.devices
+            and int(time.time() * 1000) < self.token_expiration - self._expiry_margin
+        )
+
     async def ensure_access_token(self) -> bool:
         """Ensure the access token is valid, refresh if needed."""
+        # Callers that arrive while a refresh is in flight wait for it and
+        # then see the fresh token instead of starting a refresh of their own
+        async with self._refresh_lock:
+            return await self._ensure_access_token()
+
+    async def _ensure_access_token(self) -> bool:
+        """Check the access token and refresh it; caller holds the lock."""
         if not self.access_token or not self.token_expiration:
             direct_log("No token/expiration available, performing login")
             _LOGGER.warning("No token/expiration available, performing login")
             return await self.login()
         
-        # Check if token is expired or about to expire (within 60 seconds)
+        # Check if token is expired or about to expire
         current_time = int(time.time() * 1000)  # Convert to milliseconds
-        if current_time >= (self.token_expiration - 60000):
+        if current_time >= (self.token_expiration - self._expiry_margin):
             direct_log("Token expired or about to expire, refreshing")
             _LOGGER.warning("Token expired or about to expire, refreshing")
             return await self.refresh_access_token()
@@ -316,20 +336,21 @@ class OlarmAuth:
     async def _load_tokens_from_storage(self) -> None:
         """Load tokens from storage."""
         try:
-            if not os.path.exists(self.storage_file):
+            # load_json returns an empty dict for a missing file, so the
+            # existence check happens in the executor rather than on the loop
+            tokens = await self.hass.async_add_executor_job(json_util.load_json, self.storage_file)
+            if not tokens:
                 direct_log("No token storage file exists")
                 _LOGGER.debug("No token storage file exists")
                 return
             
-            tokens = await self.hass.async_add_executor_job(json_util.load_json, self.storage_file)
-            if tokens:
-                self.user_index = tokens.get("user_index")
-                self.user_id = tokens.get("user_id")
-                self.access_token = tokens.get("access_token")
-                self.refresh_token = tokens.get("refresh_token")
-                self.token_expiration = tokens.get("token_expiration")
-                direct_log("Loaded tokens from storage")
-                _LOGGER.debug("Loaded tokens from storage")
+            self.user_index = tokens.get("user_index")
+            self.user_id = tokens.get("user_id")
+            self.access_token = tokens.get("access_token")
+            self.refresh_token = tokens.get("refresh_token")
+            self.token_expiration = tokens.get("token_expiration")
+            direct_log("Loaded tokens from storage")
+            _LOGGER.debug("Loaded tokens from storage")
                     
         except Exception as ex:
             direct_log(f"Failed to load tokens from storage: {ex}")
@@ -3,7 +3,6 @@ import logging
 import asyncio
 from typing import Any, Dict, Optional
 
-import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -40,7 +39,7 @@ async def validate_auth(hass: HomeAssistant, user_email_phone: str, user_pass: s
     try:
         return await auth.initialize()
     except Exception as e:
-        _LOGGER.error(f"Auth validation error: {e}")
+        _LOGGER.error("Auth validation error: %s", e)
         return False
 
 class OlarmConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -9,6 +9,10 @@ CONF_USER_PASS = "user_pass"
 CONF_MQTT_ONLY = "mqtt_only"
 CONF_DEBUG_MQTT = "debug_mqtt"
 DEFAULT_SCAN_INTERVAL = 30
+# Liveness sanity check only; disconnected clients retry on their own until reconnected
+MQTT_CHECK_INTERVAL = 1800
+MQTT_INITIAL_CHECK_DELAY = 30
+MQTT_CHECK_JITTER = 30  # seconds of random offset added to the first check
 
 # Alarm States
 STATE_DISARMED = "disarm"
@@ -49,6 +53,13 @@ MQTT_HOST = "mqtt-ws.olarm.com"
 MQTT_PORT = 443
 MQTT_USERNAME = "native_app"
 MQTT_PROTOCOL = "wss"
+MQTT_RECONNECT_DELAY = 2  # seconds, doubled on every attempt
+MQTT_RECONNECT_MAX_DELAY = 128  # seconds, retries continue at this delay
+MQTT_CONNECT_CONCURRENCY = 4  # simultaneous broker handshakes during setup
+MQTT_RECONNECT_CONCURRENCY = 2  # simultaneous checker-initiated reconnects
+MQTT_MIN_STATUS_REQUEST_INTERVAL = 240  # seconds
+MQTT_STATE_DEBOUNCE = 0.05  # seconds to coalesce bursts of area updates
+ACTION_DUPLICATE_WINDOW = 0.5  # seconds within which a repeated alarm command is dropped
 
 # Signal constants
 SIGNAL_OLARM_MQTT_UPDATE = f"{DOMAIN}_mqtt_update"
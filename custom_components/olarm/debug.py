@@ -1,25 +1,15 @@
 """Debug utilities for Olarm integration."""
 import logging
-import sys
-from datetime import datetime
 import traceback
 
-# Configure a direct console logger that can't be filtered
-console = logging.StreamHandler(stream=sys.stdout)
-console.setLevel(logging.WARNING)
-formatter = logging.Formatter('%(asctime)s [OLARM_DIRECT] %(message)s')
-console.setFormatter(formatter)
-
-# Create a special logger that always outputs to console
-olarm_direct_logger = logging.getLogger("olarm_direct")
-olarm_direct_logger.setLevel(logging.WARNING)
-olarm_direct_logger.addHandler(console)
-olarm_direct_logger.propagate = False  # Don't pass to parent
+# Logger for the highlighted direct/MQTT messages. It has no handler of its
+# own and propagates to Home Assistant's queue-backed handlers. Most call
+# sites also log the same text through their module logger, so these copies
+# are DEBUG and follow the integration's configured log level.
+olarm_direct_logger = logging.getLogger(f"{__package__}.direct")
 
 def direct_log(message: str, level="info"):
-    """Log directly to console, bypassing Home Assistant's log filtering."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-    
+    """Log a highlighted message to the Home Assistant log."""
     # Add level indicator
     prefix = "ℹ️"
     if level.lower() == "error":
@@ -29,20 +19,10 @@ def direct_log(message: str, level="info"):
     elif level.lower() == "debug":
         prefix = "🔍"
         
-    print(f"\n{timestamp} {prefix} OLARM DIRECT: {message}\n", flush=True)
-    
-    # Also log through the logger
-    if level.lower() == "error":
-        olarm_direct_logger.error(f"{prefix} {message}")
-    elif level.lower() == "warning":
-        olarm_direct_logger.warning(f"{prefix} {message}")
-    else:
-        olarm_direct_logger.warning(f"{prefix} {message}")  # Default to warning to ensure visibility
+    olarm_direct_logger.debug("%s OLARM DIRECT: %s", prefix, message)
 
 def mqtt_log(message: str, level="info"):
-    """Log MQTT messages directly to console."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-    
+    """Log a highlighted MQTT message to the Home Assistant log."""
     # Add level indicator
     prefix = "ℹ️"
     if level.lower() == "error":
@@ -52,20 +32,15 @@ def mqtt_log(message: str, level="info"):
     elif level.lower() == "debug":
         prefix = "🔍"
     
-    print(f"\n{timestamp} 🔵 MQTT DIRECT: {prefix} {message}\n", flush=True)
-    olarm_direct_logger.warning(f"🔵 MQTT: {prefix} {message}")
+    olarm_direct_logger.debug("🔵 MQTT DIRECT: %s %s", prefix, message)
 
 def log_exception(ex, context=""):
-    """Log exception with traceback directly to console."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-    
+    """Log exception with traceback to the Home Assistant log."""
     if context:
         context_str = f" [{context}]"
     else:
         context_str = ""
         
-    error_message = f"Exception{context_str}: {str(ex)}"
     traceback_str = "".join(traceback.format_tb(ex.__traceback__))
     
-    print(f"\n{timestamp} 🔥 EXCEPTION: {error_message}\n{traceback_str}\n", flush=True)
-    olarm_direct_logger.error(f"🔥 EXCEPTION{context_str}: {str(ex)}\n{traceback_str}")
\ No newline at end of file
+    olarm_direct_logger.error("🔥 EXCEPTION%s: %s\n%s", context_str, ex, traceback_str)
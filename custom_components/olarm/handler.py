@@ -1,9 +1,9 @@
 """Handler for Olarm API and MQTT messages."""
 import logging
 import json
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 
@@ -35,6 +35,23 @@ class OlarmMessageHandler:
         self.device_zones = {}
         self.raw_messages = {}  # Store last raw payload for debugging
         self.raw_message_count = 0
+        # (device_id, area_number) -> callback taking the new area state
+        self.area_listeners: Dict[Tuple[str, int], Callable[[str], None]] = {}
+
+    @callback
+    def async_add_area_listener(
+        self, device_id: str, area_number: int, listener: Callable[[str], None]
+    ) -> Callable[[], None]:
+        """Route state updates for one area to listener; returns a remover."""
+        key = (device_id, area_number)
+        self.area_listeners[key] = listener
+        
+        @callback
+        def remove_listener() -> None:
+            if self.area_listeners.get(key) is listener:
+                del self.area_listeners[key]
+        
+        return remove_listener
 
     async def process_mqtt_message(self, device_id: str, topic: str, payload: str) -> None:
         """Process incoming MQTT message."""
@@ -133,11 +150,12 @@ class OlarmMessageHandler:
             # Update device areas
             self.device_areas[device_id] = areas
             
-            # Dispatch update signal for each area
+            # Hand each area's state straight to the entity for that area
+            area_listeners = self.area_listeners
             for area in areas:
-                signal = f"{DOMAIN}_{device_id}_area_{area['area_number']}"
-                async_dispatcher_send(self.hass, signal, area)
-                mqtt_log(f"Dispatched {signal} with state {area['area_state']}")
+                listener = area_listeners.get((device_id, area["area_number"]))
+                if listener is not None:
+                    listener(area["area_state"])
             
             if areas_updated:
                 mqtt_log(f"✅ MQTT: Updated {len(areas)} areas for device {device_id}")
@@ -8,7 +8,7 @@ import json
 import logging
 import time
 import threading
-from typing import Dict, List, Optional, Callable, Any, Awaitable
+from typing import List, Optional, Callable, Awaitable
 
 # Set up loggers
 _LOGGER = logging.getLogger(__name__)
@@ -35,6 +35,9 @@ from .const import (
     MQTT_PORT,
     MQTT_USERNAME,
     MQTT_PROTOCOL,
+    MQTT_RECONNECT_DELAY,
+    MQTT_RECONNECT_MAX_DELAY,
+    MQTT_MIN_STATUS_REQUEST_INTERVAL,
     SIGNAL_OLARM_MQTT_UPDATE,
     CONF_DEBUG_MQTT,
 )
@@ -51,6 +54,10 @@ class OlarmMqttClient:
         device_id: str,
         device_name: str = "Unknown",
         debug_mqtt: bool = False,
+        on_message: Optional[Callable[[str, str, str], Awaitable[None]]] = None,
+        clean_session: bool = False,
+        auth=None,
+        entry_id: str = "",
     ):
         """Initialize the MQTT client."""
         self.hass = hass
@@ -58,19 +65,27 @@ class OlarmMqttClient:
         self.device_id = device_id
         self.device_name = device_name
         self.access_token = access_token
+        self.auth = auth  # OlarmAuth used to refresh the token before reconnects
+        self.entry_id = entry_id
         self.mqtt_client = None
         self.is_connected = False
         self.subscribed_topics = set()
-        self._message_callbacks = []
+        self.pending_actions = []  # MQTTMessageInfo of actions awaiting PUBACK
+        self._message_callbacks = [on_message] if on_message else []
         self.debug_mqtt = debug_mqtt
+        self.clean_session = clean_session
         self.connection_time = None
         self.messages_received = 0
         self.last_message_time = None
+        self.last_status_request_time = None
+        self.min_status_request_interval = MQTT_MIN_STATUS_REQUEST_INTERVAL
         self.connection_lock = threading.Lock()
+        self._connect_task = None
+        self._closed = False  # Set once disconnected for good; blocks reconnects
         self.reconnect_task = None
         self.reconnect_attempts = 0
-        self.max_reconnect_attempts = 5
-        self.reconnect_delay = 5  # seconds
+        self.reconnect_delay = MQTT_RECONNECT_DELAY
+        self.max_reconnect_delay = MQTT_RECONNECT_MAX_DELAY
         
         # Log initialization
         direct_log(f"Initializing MQTT client for {device_name} (IMEI: {device_imei})")
@@ -84,15 +99,35 @@ class OlarmMqttClient:
         _LOGGER.warning("Registered message callback for %s", self.device_name)
 
     async def connect(self) -> bool:
-        """Connect to MQTT broker."""
+        """Connect to MQTT broker, joining an attempt already in progress."""
+        if self._closed:
+            return False
+        # Concurrent callers (setup, the periodic check, backoff reconnects)
+        # share one attempt instead of racing two clients with one ID
+        if self._connect_task is None or self._connect_task.done():
+            self._connect_task = self.hass.async_create_task(self._async_connect())
+        # Shield so one caller being cancelled doesn't abort the shared attempt
+        return await asyncio.shield(self._connect_task)
+
+    async def _async_connect(self) -> bool:
+        """Perform a single connection attempt."""
         # Skip if paho-mqtt is not installed
         if not HAS_PAHO:
             mqtt_log("Cannot connect - paho-mqtt is not installed", "error")
             _LOGGER.error("Cannot connect - paho-mqtt is not installed")
             return False
         
+        # Retries can outlive the token captured at setup, so refresh it first
+        if self.auth is not None:
+            if not self.auth.token_is_fresh() and not await self.auth.ensure_access_token():
+                _LOGGER.error("❌ Cannot connect %s - access token refresh failed", self.device_name)
+                return False
+            self.access_token = self.auth.access_token
+        
         # Use a lock to prevent multiple simultaneous connection attempts
         with self.connection_lock:
+            if self._closed:
+                return False
             if self.is_connected:
                 mqtt_log(f"Already connected for {self.device_name}")
                 return True
@@ -101,9 +136,28 @@ class OlarmMqttClient:
                 mqtt_log(f"Connecting to broker for {self.device_name}...")
                 _LOGGER.warning("Connecting to broker for %s...", self.device_name)
                 
+                # Retire any previous client first; left running, its network
+                # thread would keep reconnecting under the same client ID and
+                # the broker would kick the two sessions off in turn
+                old_client, self.mqtt_client = self.mqtt_client, None
+                if old_client is not None:
+                    await self._async_stop_client(old_client)
+                
                 # Create MQTT client
-                client_id = f"home-assistant-oauth-{self.device_imei}-{int(time.time())}"
-                self.mqtt_client = mqtt_client.Client(client_id=client_id, transport="websockets")
+                # A persistent session needs a stable client ID so the broker
+                # can resume it (and its subscription) on reconnect. The entry
+                # ID keeps other entries or HA instances on the same account
+                # from taking over this session.
+                client_id = f"home-assistant-oauth-{self.device_imei}"
+                if self.entry_id:
+                    client_id = f"{client_id}-{self.entry_id}"
+                if self.clean_session:
+                    client_id = f"{client_id}-{int(time.time())}"
+                self.mqtt_client = mqtt_client.Client(
+                    client_id=client_id,
+                    clean_session=self.clean_session,
+                    transport="websockets",
+                )
                 self.mqtt_client.ws_set_options(path="/mqtt")  # WebSocket path
                 self.mqtt_client.username_pw_set(MQTT_USERNAME, self.access_token)
                 
@@ -144,8 +198,8 @@ class OlarmMqttClient:
                            self.device_name, connection_timeout)
                 
                 # Cleanup on timeout
-                self.mqtt_client.loop_stop()
-                self.mqtt_client = None
+                old_client, self.mqtt_client = self.mqtt_client, None
+                await self._async_stop_client(old_client)
                 return False
             
             except Exception as ex:
@@ -155,6 +209,24 @@ class OlarmMqttClient:
                            self.device_name, ex)
                 return False
 
+    async def _async_stop_client(self, client) -> None:
+        """Stop a paho client without its callbacks touching this instance."""
+        client.on_connect = None
+        client.on_disconnect = None
+        client.on_message = None
+        # loop_stop() joins the paho network thread, which can be stuck in a
+        # handshake, so keep it off the event loop. The job must not take
+        # connection_lock: the caller holds it across this await.
+        await self.hass.async_add_executor_job(self._stop_client, client)
+
+    def _stop_client(self, client) -> None:
+        """Disconnect a detached paho client and join its network thread."""
+        try:
+            client.disconnect()
+            client.loop_stop()
+        except Exception as ex:
+            log_exception(ex, f"Stopping old MQTT client for {self.device_name}")
+
     def on_connect(self, client, userdata, flags, rc):
         """Handle connection established callback."""
         if rc == 0:
@@ -168,25 +240,34 @@ class OlarmMqttClient:
                          
             self.is_connected = True
             
-            # Subscribe to device topic
+            # Subscribe to device topic, unless the broker resumed our
+            # persistent session and still holds the subscription
             topic = f"so/app/v1/{self.device_imei}"
-            self.mqtt_client.subscribe(topic)
+            if flags.get("session present"):
+                _LOGGER.debug("Resumed MQTT session for %s", self.device_name)
+            else:
+                self.mqtt_client.subscribe(topic, qos=1)
+                mqtt_log(f"[SUBSCRIBED] {self.device_name}: {topic}")
+                _LOGGER.warning("[SUBSCRIBED] %s: %s", self.device_name, topic)
             self.subscribed_topics.add(topic)
             
-            mqtt_log(f"[SUBSCRIBED] {self.device_name}: {topic}")
-            _LOGGER.warning("[SUBSCRIBED] %s: %s", self.device_name, topic)
-            
             # Request device status
             mqtt_log(f"[REQUESTING] {self.device_name}: Sending status request")
             _LOGGER.warning("[REQUESTING] %s: Sending status request", self.device_name)
-            self.publish_status_request()
+            self.publish_status_request(force=True)
         else:
             mqtt_log(f"[FAILED] {self.device_name}: Failed to connect, code: {rc}", "error")
             _LOGGER.error("[FAILED] %s: Failed to connect, code: %s", 
                       self.device_name, rc)
             self.is_connected = False
             
-            # Schedule a reconnect
+            # Bad credentials (4) or not authorised (5) can't recover
+            # without a way to refresh the token
+            if rc in (4, 5) and self.auth is None:
+                _LOGGER.error("❌ %s: Broker rejected the access token, not retrying", self.device_name)
+                return
+            
+            # Schedule a reconnect (which refreshes the token when it can)
             if self.reconnect_task is None:
                 self.schedule_reconnect()
 
@@ -208,40 +289,45 @@ class OlarmMqttClient:
                 self.schedule_reconnect()
 
     def schedule_reconnect(self):
-        """Schedule a reconnect attempt after a delay."""
-        if self.reconnect_attempts >= self.max_reconnect_attempts:
-            mqtt_log(f"Max reconnect attempts ({self.max_reconnect_attempts}) reached for {self.device_name}", "warning")
-            _LOGGER.warning("Max reconnect attempts (%d) reached for %s", 
-                         self.max_reconnect_attempts, self.device_name)
-            self.reconnect_task = None
+        """Schedule a reconnect attempt after an exponential backoff delay."""
+        if self._closed:
             return
-            
+        
+        # Keep retrying at the capped delay until a connect succeeds
         self.reconnect_attempts += 1
-        delay = self.reconnect_delay * (2 ** (self.reconnect_attempts - 1))  # Exponential backoff
+        delay = min(
+            self.reconnect_delay * (2 ** min(self.reconnect_attempts - 1, 16)),  # Exponential backoff
+            self.max_reconnect_delay,
+        )
         mqtt_log(f"Scheduling reconnect for {self.device_name} in {delay} seconds (attempt {self.reconnect_attempts})")
         _LOGGER.warning("Scheduling reconnect for %s in %d seconds (attempt %d)", 
                      self.device_name, delay, self.reconnect_attempts)
         
-        asyncio.run_coroutine_threadsafe(self._delayed_reconnect(delay), self.hass.loop)
+        # Set before the task starts so a racing disconnect can't start a second chain
+        self.reconnect_task = asyncio.run_coroutine_threadsafe(
+            self._delayed_reconnect(delay), self.hass.loop
+        )
 
     async def _delayed_reconnect(self, delay):
-        """Reconnect after a delay."""
+        """Reconnect after a delay, rescheduling if the attempt fails."""
+        connected = False
         try:
-            self.reconnect_task = asyncio.current_task()
             await asyncio.sleep(delay)
             
             # Check if we're already connected (might have connected through another means)
             if self.is_connected:
                 mqtt_log(f"Already reconnected to {self.device_name}, canceling reconnect task")
-                self.reconnect_task = None
                 return
                 
             mqtt_log(f"Attempting reconnect for {self.device_name} after {delay}s delay")
-            await self.connect()
+            connected = await self.connect()
         except Exception as ex:
             log_exception(ex, f"Delayed reconnect for {self.device_name}")
         finally:
             self.reconnect_task = None
+        
+        if not connected and not self.is_connected:
+            self.schedule_reconnect()
 
     def on_message(self, client, userdata, msg: MQTTMessage):
         """Handle message received callback."""
@@ -264,11 +350,11 @@ class OlarmMqttClient:
             # Try to parse as JSON to display more nicely
             try:
                 payload_obj = json.loads(payload)
-                mqtt_log(f"[PAYLOAD JSON] {json.dumps(payload_obj, indent=2)[:500]}...")
+                _LOGGER.info("[PAYLOAD JSON] %s...", json.dumps(payload_obj, indent=2)[:500])
             except json.JSONDecodeError:
                 # Not JSON, show as text
                 shortened_payload = payload[:500] + ("..." if len(payload) > 500 else "")
-                mqtt_log(f"[PAYLOAD RAW] {shortened_payload}")
+                _LOGGER.info("[PAYLOAD RAW] %s", shortened_payload)
         
         # Process message in the event loop
         asyncio.run_coroutine_threadsafe(
@@ -304,13 +390,21 @@ class OlarmMqttClient:
         except Exception as ex:
             log_exception(ex, f"MQTT process message for {self.device_name}")
 
-    def publish_status_request(self):
-        """Request device status."""
+    def publish_status_request(self, force: bool = False):
+        """Request device status, unless fresh state arrived very recently."""
         if not self.is_connected or not self.mqtt_client:
             mqtt_log(f"⚠️ Cannot request status - client not connected for {self.device_name}", "warning")
             _LOGGER.warning("⚠️ Cannot request status - client not connected for %s", self.device_name)
             return False
         
+        # A message or request inside the window means the state is already fresh
+        if not force:
+            now = time.time()
+            for last in (self.last_message_time, self.last_status_request_time):
+                if last is not None and now - last < self.min_status_request_interval:
+                    _LOGGER.debug("Skipping status request for %s, state is fresh", self.device_name)
+                    return True
+        
         topic = f"si/app/v2/{self.device_imei}/status"
         payload = json.dumps({"method": "GET"})
         
@@ -326,6 +420,7 @@ class OlarmMqttClient:
                           self.device_name, result.rc)
                 return False
             
+            self.last_status_request_time = time.time()
             mqtt_log(f"Status request published successfully for {self.device_name}")
             _LOGGER.warning("Status request published successfully for %s", self.device_name)
             return True
@@ -359,6 +454,12 @@ class OlarmMqttClient:
                           self.device_name, result.rc)
                 return False
             
+            # Remember in-flight actions so a disconnect can let them finish
+            self.pending_actions = [
+                info for info in self.pending_actions if not info.is_published()
+            ]
+            self.pending_actions.append(result)
+            
             mqtt_log(f"✅ Action '{action_cmd}' for area {area_num} published to {self.device_name}")
             _LOGGER.warning("✅ Action '%s' for area %s published to %s", 
                        action_cmd, area_num, self.device_name)
@@ -367,8 +468,34 @@ class OlarmMqttClient:
             log_exception(ex, f"Publish action for {self.device_name}")
             return False
 
+    async def async_disconnect(self, timeout: float = 5) -> None:
+        """Let in-flight actions finish, then disconnect off the event loop."""
+        # Stop pending reconnect work first so nothing starts a new paho
+        # client after this one is torn down
+        self._closed = True
+        for task in (self.reconnect_task, self._connect_task):
+            if task is not None:
+                task.cancel()
+        await self.hass.async_add_executor_job(self._flush_and_disconnect, timeout)
+
+    def _flush_and_disconnect(self, timeout: float) -> None:
+        """Wait up to timeout seconds for pending action PUBACKs, then disconnect."""
+        deadline = time.monotonic() + timeout
+        for info in self.pending_actions:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                info.wait_for_publish(remaining)
+            except (RuntimeError, ValueError):
+                # Not connected (or never queued); nothing left to flush
+                break
+        self.pending_actions.clear()
+        self.disconnect()
+
     def disconnect(self):
-        """Disconnect from MQTT broker."""
+        """Disconnect from MQTT broker for good."""
+        self._closed = True
         with self.connection_lock:
             if self.mqtt_client:
                 try:
@@ -382,33 +509,16 @@ class OlarmMqttClient:
                     mqtt_log(f"Disconnected from broker for {self.device_name}")
                     _LOGGER.warning("Disconnected from broker for %s", self.device_name)
             
-    def get_status(self) -> Dict[str, Any]:
-        """Get the status of this MQTT client."""
-        now = time.time()
-        
-        uptime = None
-        if self.connection_time:
-            uptime = int(now - self.connection_time)
-            
-        last_msg_age = None
-        if self.last_message_time:
-            last_msg_age = int(now - self.last_message_time)
-            
-        status = {
-            "device_id": self.device_id,
-            "device_name": self.device_name,
-            "device_imei": self.device_imei,
-            "is_connected": self.is_connected,
-            "messages_received": self.messages_received,
-            "uptime_seconds": uptime,
-            "last_message_seconds_ago": last_msg_age,
-            "subscribed_topics": list(self.subscribed_topics),
-            "reconnect_attempts": self.reconnect_attempts,
-        }
-        
-        # Log the status
-        mqtt_log(f"STATUS [{self.device_name}]: Connected={self.is_connected}, Messages={self.messages_received}")
-        _LOGGER.warning("STATUS [%s]: Connected=%s, Messages=%d",
-                    self.device_name, self.is_connected, self.messages_received)
-        
-        return status
\ No newline at end of file
+    @property
+    def uptime_seconds(self) -> Optional[int]:
+        """Return whole seconds since the last successful connect."""
+        if not self.connection_time:
+            return None
+        return int(time.time() - self.connection_time)
+
+    @property
+    def last_message_seconds_ago(self) -> Optional[int]:
+        """Return whole seconds since the last received message."""
+        if not self.last_message_time:
+            return None
+        return int(time.time() - self.last_message_time)